@@ -4,19 +4,21 @@ from dotenv import load_dotenv
 load_dotenv()
 
 class Config:
-    BOT_TOKEN = os.getenv("BOT_TOKEN")
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    GIGACHAT_API_KEY = os.getenv("GIGACHAT_API_KEY")  # Fallback для GigaChat
-    GIGACHAT_CLIENT_ID = os.getenv("GIGACHAT_CLIENT_ID")  # Для OAuth2
-    GIGACHAT_CLIENT_SECRET = os.getenv("GIGACHAT_CLIENT_SECRET")  # Для OAuth2
-    GIGACHAT_AUTH_KEY = os.getenv("GIGACHAT_AUTH_KEY")  # Готовый base64 "client_id:secret"
-    
-    POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
-    POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
-    POSTGRES_DB = os.getenv("POSTGRES_DB", "hr_traine")
-    # In Docker, use 'db' service name; locally use 'localhost'
-    POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
-    POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
+    def __init__(self):
+        # Read env at instantiation time so a fresh Config() picks up changes
+        self.BOT_TOKEN = os.getenv("BOT_TOKEN")
+        self.GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+        self.GIGACHAT_API_KEY = os.getenv("GIGACHAT_API_KEY")  # Fallback для GigaChat
+        self.GIGACHAT_CLIENT_ID = os.getenv("GIGACHAT_CLIENT_ID")  # Для OAuth2
+        self.GIGACHAT_CLIENT_SECRET = os.getenv("GIGACHAT_CLIENT_SECRET")  # Для OAuth2
+        self.GIGACHAT_AUTH_KEY = os.getenv("GIGACHAT_AUTH_KEY")  # Готовый base64 "client_id:secret"
+
+        self.POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
+        self.POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
+        self.POSTGRES_DB = os.getenv("POSTGRES_DB", "hr_traine")
+        # In Docker, use 'db' service name; locally use 'localhost'
+        self.POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
+        self.POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
 
     @property
     def DATABASE_URL(self):
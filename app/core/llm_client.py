@@ -572,7 +572,8 @@ class LLMClient:
             logger.error(f"LLM validation error: {e}")
             return {"valid": True, "issues": [f"Validation error: {str(e)}"], "suggestions": []}
     
-    def _format_excel_for_llm(self, excel_data: dict) -> str:
+    @staticmethod
+    def _format_excel_for_llm(excel_data: dict) -> str:
         """Format Excel data into readable text for LLM"""
         formatted = []
         for sheet_name, data in excel_data.items():
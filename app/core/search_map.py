@@ -1,5 +1,6 @@
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import IO, List, Dict, Any, Optional, Union
+from pathlib import Path
 import os
 
 class SearchMapValidator:
@@ -7,17 +8,31 @@ class SearchMapValidator:
         "Company", "Position", "Source", "Contact", "Status"
     ]
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: Union[str, Path, IO[bytes]]):
+        # A path, or a binary file object; a nameless one is sniffed by content
         self.file_path = file_path
         self.df: Optional[pd.DataFrame] = None
         self.errors: List[str] = []
 
+    def _file_name(self) -> str:
+        if isinstance(self.file_path, (str, os.PathLike)):
+            return os.fspath(self.file_path)
+        return str(getattr(self.file_path, "name", ""))
+
+    def _rewind(self) -> None:
+        if hasattr(self.file_path, "seek"):
+            self.file_path.seek(0)
+
     def load(self) -> bool:
         try:
-            if self.file_path.endswith('.csv'):
+            file_name = self._file_name()
+            self._rewind()
+            if file_name.endswith('.csv'):
                 self.df = pd.read_csv(self.file_path)
-            elif self.file_path.endswith(('.xls', '.xlsx')):
-                self.df = pd.read_excel(self.file_path)
+            elif file_name.endswith(('.xls', '.xlsx')):
+                self.df = pd.read_excel(self.file_path, engine=self._excel_engine())
+            elif not file_name and hasattr(self.file_path, "read"):
+                self.df = self._read_unnamed()
             else:
                 self.errors.append("Unsupported file format")
                 return False
@@ -26,6 +41,18 @@ class SearchMapValidator:
             self.errors.append(f"Failed to load file: {str(e)}")
             return False
 
+    def _read_unnamed(self) -> pd.DataFrame:
+        """Excel is detected by its magic bytes, anything else is read as CSV"""
+        try:
+            return pd.read_excel(self.file_path)
+        except ValueError:
+            self._rewind()
+            return pd.read_csv(self.file_path)
+
+    def _excel_engine(self) -> Optional[str]:
+        """openpyxl for .xlsx; legacy .xls is left to pandas' engine detection"""
+        return "openpyxl" if self._file_name().endswith('.xlsx') else None
+
     def validate_structure(self) -> bool:
         if self.df is None:
             return False
@@ -54,7 +81,7 @@ class SearchMapValidator:
 
         # Example checks
         if "Contact" in self.df.columns:
-            report["empty_contacts"] = self.df["Contact"].isna().sum()
+            report["empty_contacts"] = int(self.df["Contact"].isna().sum())
         
         # Logic: If too many empty contacts, flag it
         if report["empty_contacts"] > len(self.df) * 0.5:
@@ -73,21 +100,19 @@ class SearchMapValidator:
         
         # Try to extract data from different sheets if available
         try:
-            import pandas as pd
-            
-            # Read all sheets
-            excel_file = pd.ExcelFile(self.file_path)
+            # Open the workbook once and parse every sheet from it
             all_data = {}
-            
-            for sheet_name in excel_file.sheet_names:
-                df = pd.read_excel(self.file_path, sheet_name=sheet_name)
-                # Convert to dict, handling NaN values
-                sheet_data = {}
-                for col in df.columns:
-                    values = df[col].dropna().tolist()
-                    if values:
-                        sheet_data[col] = values if len(values) > 1 else values[0]
-                all_data[sheet_name] = sheet_data
+            self._rewind()
+            with pd.ExcelFile(self.file_path, engine=self._excel_engine()) as excel_file:
+                for sheet_name in excel_file.sheet_names:
+                    df = excel_file.parse(sheet_name)
+                    # Convert to dict, handling NaN values
+                    sheet_data = {}
+                    for col in df.columns:
+                        values = df[col].dropna().tolist()
+                        if values:
+                            sheet_data[col] = values if len(values) > 1 else values[0]
+                    all_data[sheet_name] = sheet_data
             
             return all_data
         except Exception as e:
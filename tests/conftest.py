@@ -1,18 +1,33 @@
 import pytest
+import asyncio
 import os
-from unittest.mock import Mock, AsyncMock, MagicMock
+import logging
+import openpyxl  # noqa: F401  (pandas imports it lazily on the first read_excel)
+import pandas as pd
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from aiogram.fsm.context import FSMContext
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.pool import StaticPool
 from app.database.base import Base, get_session
 from app.database.models import User, OnboardingStep, CandidateProfile, OnboardingSubmission, UserRole, StepType
 
+# Keep SQLAlchemy quiet in tests: no per-statement log-level checks walking up to root
+for _logger_name in ("sqlalchemy.engine", "sqlalchemy.pool", "sqlalchemy.dialects", "sqlalchemy.orm"):
+    logging.getLogger(_logger_name).setLevel(logging.WARNING)
+    logging.getLogger(_logger_name).propagate = False
+
 # Use in-memory SQLite for tests (Note: pgvector not supported, but models should still work)
+# Every pytest-xdist worker is a separate process and gets its own in-memory database
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 async def test_engine():
-    """Create test database engine"""
+    """Create test database engine and schema once per session"""
     engine = create_async_engine(
         TEST_DATABASE_URL,
         connect_args={"check_same_thread": False},
@@ -20,6 +35,15 @@ async def test_engine():
         echo=False
     )
     
+    # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with (aio)sqlite
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
     async with engine.begin() as conn:
         # Create tables, but skip Vector type (not supported in SQLite)
         # Create a custom metadata without Vector columns
@@ -104,33 +128,93 @@ async def test_engine():
     
     await engine.dispose()
 
-@pytest.fixture
-async def test_session(test_engine):
-    """Create test database session"""
-    async_session = async_sessionmaker(
-        test_engine, class_=AsyncSession, expire_on_commit=False
+@pytest.fixture(scope="class")
+async def db_connection(test_engine):
+    """Connection whose outer transaction spans one test class"""
+    async with test_engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            yield conn
+        finally:
+            await trans.rollback()
+
+def _savepoint_session(connection):
+    """AsyncSession on connection whose commit() only releases a SAVEPOINT"""
+    return AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
     )
-    
-    async with async_session() as session:
+
+@pytest.fixture
+async def test_session(db_connection):
+    """Create test database session rolled back after each test"""
+    savepoint = await db_connection.begin_nested()
+    session = _savepoint_session(db_connection)
+    try:
         yield session
+    finally:
+        await session.close()
+        await savepoint.rollback()
+
+@pytest.fixture
+def patch_get_session(mocker, test_session):
+    """Patch get_session in a handler module to yield test_session"""
+    def _patch(module_path):
+        async def _get_session():
+            yield test_session
+        mocker.patch(f"{module_path}.get_session", _get_session)
+    return _patch
+
+@pytest.fixture
+def llm_mock(mocker):
+    """Mock LLM client used by interview handlers"""
+    m = mocker.patch('app.bot.handlers.interview.llm_client')
+    m.detect_interview_farewell = AsyncMock()
+    m.simulate_candidate = AsyncMock()
+    m.generate_interview_report = AsyncMock()
+    return m
+
+@pytest.fixture
+def search_map_llm_mock(mocker):
+    """Mock LLM client used by SearchMapValidator, reporting a valid map"""
+    m = mocker.patch('app.core.llm_client.llm_client')
+    m.validate_search_map = AsyncMock(return_value={"valid": True, "issues": [], "suggestions": []})
+    return m
+
+@dataclass(slots=True)
+class FakeUser:
+    """Minimal Telegram user"""
+    id: int = 12345
+    username: str = "testuser"
+
+
+@dataclass(slots=True)
+class FakeChat:
+    """Minimal Telegram chat"""
+    id: int = 12345
+
+
+@dataclass(slots=True)
+class FakeMessage:
+    """Lightweight Telegram message: plain fields plus AsyncMock senders"""
+    text: Optional[str] = "/start"
+    document: Any = None
+    from_user: FakeUser = field(default_factory=FakeUser)
+    chat: FakeChat = field(default_factory=FakeChat)
+    answer: AsyncMock = field(default_factory=AsyncMock)
+    answer_document: AsyncMock = field(default_factory=AsyncMock)
+
 
 @pytest.fixture
 def mock_message():
     """Mock Telegram message"""
-    message = Mock()
-    message.from_user = Mock()
-    message.from_user.id = 12345
-    message.from_user.username = "testuser"
-    message.text = "/start"
-    message.answer = AsyncMock()
-    message.answer_document = AsyncMock()
-    message.document = None
-    return message
+    return FakeMessage()
 
 @pytest.fixture
 def mock_state():
     """Mock FSM state"""
-    state = AsyncMock()
+    state = MagicMock(spec=FSMContext)
     state.get_data = AsyncMock(return_value={})
     state.update_data = AsyncMock()
     state.set_state = AsyncMock()
@@ -145,15 +229,32 @@ def mock_bot():
     bot.download_file = AsyncMock()
     return bot
 
+SAMPLE_USER = {
+    "telegram_id": 12345,
+    "username": "testuser",
+    "full_name": "Test User",
+    "role": UserRole.STUDENT,
+}
+
+SAMPLE_ONBOARDING_STEP = {
+    "title": "Test Step",
+    "description": "Test Description",
+    "order": 1,
+    "step_type": StepType.CONTENT,
+    "estimated_duration": 30,
+}
+
+SAMPLE_CANDIDATE = {
+    "name": "Test Candidate",
+    "resume_text": "Test resume text",
+    "category": "Test",
+    "psychotype": "Target",
+}
+
 @pytest.fixture
 async def sample_user(test_session):
     """Create sample user in test database"""
-    user = User(
-        telegram_id=12345,
-        username="testuser",
-        full_name="Test User",
-        role=UserRole.STUDENT
-    )
+    user = User(**SAMPLE_USER)
     test_session.add(user)
     await test_session.commit()
     await test_session.refresh(user)
@@ -162,13 +263,7 @@ async def sample_user(test_session):
 @pytest.fixture
 async def sample_onboarding_step(test_session):
     """Create sample onboarding step in test database"""
-    step = OnboardingStep(
-        title="Test Step",
-        description="Test Description",
-        order=1,
-        step_type=StepType.CONTENT,
-        estimated_duration=30
-    )
+    step = OnboardingStep(**SAMPLE_ONBOARDING_STEP)
     test_session.add(step)
     await test_session.commit()
     await test_session.refresh(step)
@@ -177,26 +272,136 @@ async def sample_onboarding_step(test_session):
 @pytest.fixture
 async def sample_candidate(test_session):
     """Create sample candidate in test database"""
-    candidate = CandidateProfile(
-        name="Test Candidate",
-        resume_text="Test resume text",
-        category="Test",
-        psychotype="Target"
-    )
+    candidate = CandidateProfile(**SAMPLE_CANDIDATE)
     test_session.add(candidate)
     await test_session.commit()
     await test_session.refresh(candidate)
     return candidate
 
-# Mock environment variables for tests
-@pytest.fixture(autouse=True)
-def mock_env(monkeypatch):
+@pytest.fixture
+async def sample_seed(test_session):
+    """Create sample user, onboarding step and candidate via INSERT ... RETURNING"""
+    user = (await test_session.scalars(insert(User).returning(User), [SAMPLE_USER])).one()
+    step = (await test_session.scalars(
+        insert(OnboardingStep).returning(OnboardingStep), [SAMPLE_ONBOARDING_STEP]
+    )).one()
+    candidate = (await test_session.scalars(
+        insert(CandidateProfile).returning(CandidateProfile), [SAMPLE_CANDIDATE]
+    )).one()
+    await test_session.commit()
+    return user, step, candidate
+
+@pytest.fixture(scope="class")
+async def class_seed(db_connection):
+    """Sample user and onboarding step inserted once per test class (read-only)"""
+    async with _savepoint_session(db_connection) as session:
+        user = (await session.scalars(insert(User).returning(User), [SAMPLE_USER])).one()
+        step = (await session.scalars(
+            insert(OnboardingStep).returning(OnboardingStep), [SAMPLE_ONBOARDING_STEP]
+        )).one()
+        await session.commit()
+    return user, step
+
+@pytest.fixture(scope="class")
+async def existing_user(db_connection):
+    """User with telegram_id 99999 inserted once per test class (read-only)"""
+    async with _savepoint_session(db_connection) as session:
+        user = User(telegram_id=99999, username="user1", full_name="User 1")
+        session.add(user)
+        await session.commit()
+    return user
+
+@pytest.fixture
+def make_submission(test_session):
+    """Factory creating an onboarding submission (flushed, not committed)"""
+    async def _make(**kwargs):
+        submission = OnboardingSubmission(**kwargs)
+        test_session.add(submission)
+        await test_session.flush()
+        return submission
+    return _make
+
+@pytest.fixture
+def no_api_key(monkeypatch):
+    """LLM client config without Gemini key and without GigaChat"""
+    monkeypatch.setattr('app.core.llm_client.config.GEMINI_API_KEY', None)
+    monkeypatch.setattr('app.core.llm_client.GIGACHAT_AVAILABLE', False)
+
+@pytest.fixture(scope="module")
+def genai_patched():
+    """app.core.llm_client.genai patched once for a whole test module"""
+    with patch('app.core.llm_client.genai') as mock_genai:
+        yield mock_genai
+
+@pytest.fixture
+def gemini_mocks(monkeypatch, genai_patched):
+    """Patched genai with a Gemini key set: (mock_genai, mock_model)
+
+    The module-wide genai mock is reset per test and gets a fresh model.
+    """
+    monkeypatch.setattr('app.core.llm_client.config.GEMINI_API_KEY', "test_key")
+    genai_patched.reset_mock()
+    mock_model = AsyncMock()
+    genai_patched.GenerativeModel.return_value = mock_model
+    return genai_patched, mock_model
+
+@pytest.fixture
+def gemini_failing(gemini_mocks):
+    """gemini_mocks with a model that raises on every generate call"""
+    mock_genai, mock_model = gemini_mocks
+    mock_model.generate_content_async = AsyncMock(side_effect=Exception("API Error"))
+    return mock_genai, mock_model
+
+@pytest.fixture
+async def stub_executor(monkeypatch):
+    """Run loop.run_in_executor calls inline on the test loop"""
+    loop = asyncio.get_running_loop()
+
+    def immediate(executor, func, *args):
+        fut = loop.create_future()
+        try:
+            fut.set_result(func(*args))
+        except Exception as e:
+            fut.set_exception(e)
+        return fut
+
+    monkeypatch.setattr(loop, "run_in_executor", immediate)
+
+# Environment for tests that read app.config
+_TEST_ENV = {
+    "BOT_TOKEN": "test_token",
+    "GEMINI_API_KEY": "test_gemini_key",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_DB": "test_db",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+}
+
+@pytest.fixture
+def mock_env():
     """Mock environment variables"""
-    monkeypatch.setenv("BOT_TOKEN", "test_token")
-    monkeypatch.setenv("GEMINI_API_KEY", "test_gemini_key")
-    monkeypatch.setenv("POSTGRES_USER", "postgres")
-    monkeypatch.setenv("POSTGRES_PASSWORD", "postgres")
-    monkeypatch.setenv("POSTGRES_DB", "test_db")
-    monkeypatch.setenv("POSTGRES_HOST", "localhost")
-    monkeypatch.setenv("POSTGRES_PORT", "5432")
+    with patch.dict(os.environ, _TEST_ENV):
+        yield
+
+# Search map rows with every column SearchMapValidator requires
+# (tests/assets/search_map_sample.xlsx holds the same rows)
+SAMPLE_SEARCH_MAP = {
+    'Company': ['Company1', 'Company2'],
+    'Position': ['Position1', 'Position2'],
+    'Source': ['Source1', 'Source2'],
+    'Contact': ['Contact1', 'Contact2'],
+    'Status': ['Status1', 'Status2'],
+}
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+
+@pytest.fixture(scope="session")
+def sample_xlsx():
+    """Path to the committed search map xlsx"""
+    return str(ASSETS_DIR / "search_map_sample.xlsx")
 
+@pytest.fixture(scope="module")
+def valid_df():
+    """Search map DataFrame with all required columns, shared read-only per module"""
+    return pd.DataFrame(SAMPLE_SEARCH_MAP)
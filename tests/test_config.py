@@ -4,6 +4,8 @@ import os
 from unittest.mock import patch
 from app.config import Config
 
+pytestmark = pytest.mark.usefixtures("mock_env")
+
 
 class TestConfig:
     """Test configuration class"""
@@ -13,8 +15,9 @@ class TestConfig:
         config = Config()
         assert config is not None
     
-    def test_database_url_property(self):
+    def test_database_url_property(self, monkeypatch):
         """Test DATABASE_URL property generation"""
+        monkeypatch.delenv("POSTGRES_DB", raising=False)
         config = Config()
         url = config.DATABASE_URL
         assert url.startswith("postgresql+asyncpg://")
@@ -29,12 +32,7 @@ class TestConfig:
         monkeypatch.setenv("POSTGRES_HOST", "custom_host")
         monkeypatch.setenv("POSTGRES_PORT", "5433")
         
-        # Reload config
-        import importlib
-        from app import config
-        importlib.reload(config)
-        
-        url = config.config.DATABASE_URL
+        url = Config().DATABASE_URL
         assert "custom_user" in url
         assert "custom_pass" in url
         assert "custom_db" in url
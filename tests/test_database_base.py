@@ -11,7 +11,6 @@ class TestDatabaseBase:
         """Test that Base class exists"""
         assert Base is not None
     
-    @pytest.mark.asyncio
     async def test_get_session_generator(self):
         """Test that get_session is a generator"""
         # Note: This will try to use real DB connection
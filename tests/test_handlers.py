@@ -1,16 +1,22 @@
 """Tests for bot handlers"""
 import pytest
-from unittest.mock import AsyncMock, Mock, patch
 from datetime import datetime
+from sqlalchemy import select
 from app.bot.handlers import registration, onboarding, interview, expert, common
-from app.database.models import User, UserRole, OnboardingStep, StepType, CandidateProfile, OnboardingSubmission
+from app.database.models import User, UserRole, OnboardingStep, StepType, CandidateProfile
 from app.bot.states import RegistrationStates, OnboardingStates, InterviewStates
 
 
+def _async_returning(value):
+    """Plain coroutine function returning value, lighter than AsyncMock"""
+    async def _f(*args, **kwargs):
+        return value
+    return _f
+
+
 class TestRegistrationHandlers:
     """Test registration handlers"""
     
-    @pytest.mark.asyncio
     async def test_cmd_start(self, mock_message, mock_state):
         """Test /start command"""
         await common.cmd_start(mock_message, mock_state)
@@ -18,7 +24,6 @@ class TestRegistrationHandlers:
         mock_message.answer.assert_called_once()
         mock_state.set_state.assert_called_once_with(RegistrationStates.waiting_for_name)
     
-    @pytest.mark.asyncio
     async def test_cmd_help(self, mock_message):
         """Test /help command"""
         await common.cmd_help(mock_message)
@@ -28,18 +33,13 @@ class TestRegistrationHandlers:
         assert "/start" in call_args
         assert "/onboarding" in call_args
     
-    @pytest.mark.asyncio
-    async def test_process_name_new_user(self, mock_message, mock_state, test_session, mocker):
+    async def test_process_name_new_user(self, mock_message, mock_state, test_session, patch_get_session):
         """Test processing name for new user"""
         mock_message.text = "John Doe"
         mock_message.from_user.id = 99999
         mock_message.from_user.username = "johndoe"
         
-        # Mock get_session
-        async def mock_get_session():
-            yield test_session
-        
-        mocker.patch('app.bot.handlers.registration.get_session', mock_get_session)
+        patch_get_session('app.bot.handlers.registration')
         
         await registration.process_name(mock_message, mock_state)
         
@@ -48,22 +48,18 @@ class TestRegistrationHandlers:
         mock_state.clear.assert_called_once()
         
         # Verify user was created
-        from sqlalchemy.future import select
-        result = await test_session.execute(select(User).where(User.telegram_id == 99999))
-        user = result.scalar_one_or_none()
-        assert user is not None
+        user_id = await test_session.scalar(select(User.id).where(User.telegram_id == 99999))
+        assert user_id is not None
+        # Served from the identity map, the handler shares this session
+        user = await test_session.get(User, user_id)
         assert user.full_name == "John Doe"
     
-    @pytest.mark.asyncio
-    async def test_process_name_existing_user(self, mock_message, mock_state, test_session, sample_user, mocker):
+    async def test_process_name_existing_user(self, mock_message, mock_state, test_session, sample_user, patch_get_session):
         """Test processing name for existing user"""
         mock_message.text = "Updated Name"
         mock_message.from_user.id = sample_user.telegram_id
         
-        async def mock_get_session():
-            yield test_session
-        
-        mocker.patch('app.bot.handlers.registration.get_session', mock_get_session)
+        patch_get_session('app.bot.handlers.registration')
         
         await registration.process_name(mock_message, mock_state)
         
@@ -75,99 +71,68 @@ class TestRegistrationHandlers:
 class TestOnboardingHandlers:
     """Test onboarding handlers"""
     
-    @pytest.mark.asyncio
-    async def test_cmd_onboarding_user_not_found(self, mock_message, mock_state, test_session, mocker):
+    async def test_cmd_onboarding_user_not_found(self, mock_message, mock_state, patch_get_session):
         """Test /onboarding when user is not registered"""
-        mock_message.from_user.id = 99999
-        
-        async def mock_get_session():
-            yield test_session
-        
-        mocker.patch('app.bot.handlers.labs.get_session', mock_get_session)
+        patch_get_session('app.bot.handlers.labs')
         
         await onboarding.cmd_onboarding(mock_message, mock_state)
         
         mock_message.answer.assert_called_once()
         assert "зарегистр" in mock_message.answer.call_args[0][0].lower()
     
-    @pytest.mark.asyncio
-    async def test_cmd_onboarding_all_steps_completed(self, mock_message, mock_state, test_session, sample_user, sample_onboarding_step, mocker):
-        """Test /onboarding when all steps are completed"""
-        
-        # Create completed submission
-        submission = OnboardingSubmission(
-            user_id=sample_user.id,
-            step_id=sample_onboarding_step.id,
-            status="approved"
-        )
-        test_session.add(submission)
-        await test_session.commit()
-        
-        async def mock_get_session():
-            yield test_session
-        
-        mocker.patch('app.bot.handlers.labs.get_session', mock_get_session)
-        
-        await onboarding.cmd_onboarding(mock_message, mock_state)
-        
-        mock_message.answer.assert_called_once()
-        text = mock_message.answer.call_args[0][0].lower()
-        assert "заверш" in text or "готово" in text or "great job" in text
-    
-    @pytest.mark.asyncio
-    async def test_cmd_onboarding_show_next_step(self, mock_message, mock_state, test_session, sample_user, sample_onboarding_step, mocker):
-        """Test /onboarding showing next step"""
-        async def mock_get_session():
-            yield test_session
-        
-        mocker.patch('app.bot.handlers.labs.get_session', mock_get_session)
+    @pytest.mark.parametrize("seed,expected", [
+        ("completed", ("заверш", "готово", "great job")),
+        ("pending", ("test step", "шаг", "step")),
+    ], ids=["all_steps_completed", "show_next_step"])
+    async def test_cmd_onboarding(self, mock_message, mock_state, sample_seed, make_submission, patch_get_session, seed, expected):
+        """Test /onboarding for finished onboarding and next step"""
+        sample_user, sample_onboarding_step, _ = sample_seed
+        if seed == "completed":
+            # Create completed submission
+            await make_submission(
+                user_id=sample_user.id,
+                step_id=sample_onboarding_step.id,
+                status="approved"
+            )
+        
+        patch_get_session('app.bot.handlers.labs')
         
         await onboarding.cmd_onboarding(mock_message, mock_state)
         
-        # Should show step information
         assert mock_message.answer.called
-        call_args = mock_message.answer.call_args[0][0]
-        assert sample_onboarding_step.title in call_args or "Шаг" in call_args or "Step" in call_args
+        if seed == "completed":
+            mock_message.answer.assert_called_once()
+        text = mock_message.answer.call_args[0][0].lower()
+        assert any(s in text for s in expected)
 
 
 class TestInterviewHandlers:
     """Test interview handlers"""
     
-    @pytest.mark.asyncio
-    async def test_cmd_interview_no_candidates(self, mock_message, mock_state, test_session, mocker):
-        """Test /interview when no candidates exist"""
-        async def mock_get_session():
-            yield test_session
-        
-        mocker.patch('app.bot.handlers.interview.get_session', mock_get_session)
+    async def test_cmd_interview_no_candidates(self, mock_message, mock_state, patch_get_session):
+        """Test /interview without existing candidates"""
+        patch_get_session('app.bot.handlers.interview')
         
         await interview.cmd_interview(mock_message, mock_state)
         
         # Should create dummy candidate or show message
         mock_message.answer.assert_called_once()
     
-    @pytest.mark.asyncio
-    async def test_cmd_interview_with_candidates(self, mock_message, mock_state, test_session, sample_candidate, mocker):
+    async def test_cmd_interview_with_candidates(self, mock_message, mock_state, sample_candidate, patch_get_session):
         """Test /interview with existing candidates"""
-        async def mock_get_session():
-            yield test_session
-        
-        mocker.patch('app.bot.handlers.interview.get_session', mock_get_session)
+        patch_get_session('app.bot.handlers.interview')
         
         await interview.cmd_interview(mock_message, mock_state)
         
         mock_message.answer.assert_called_once()
         mock_state.set_state.assert_called_once_with(InterviewStates.choosing_candidate)
     
-    @pytest.mark.asyncio
-    async def test_start_interview(self, mock_message, mock_state, test_session, sample_user, sample_candidate, mocker):
+    async def test_start_interview(self, mock_message, mock_state, sample_seed, patch_get_session):
         """Test starting interview"""
+        _, _, sample_candidate = sample_seed
         mock_message.text = sample_candidate.name
         
-        async def mock_get_session():
-            yield test_session
-        
-        mocker.patch('app.bot.handlers.interview.get_session', mock_get_session)
+        patch_get_session('app.bot.handlers.interview')
         
         await interview.start_interview(mock_message, mock_state)
         
@@ -176,13 +141,16 @@ class TestInterviewHandlers:
         assert sample_candidate.name in call_args
         mock_state.set_state.assert_called_once_with(InterviewStates.in_interview)
     
-    @pytest.mark.asyncio
-    async def test_process_chat_farewell(self, mock_message, mock_state, mocker):
-        """Test interview ending with farewell detection"""
-        mock_message.text = "Спасибо за интервью, до свидания!"
+    @pytest.mark.parametrize("text,is_farewell", [
+        ("Спасибо за интервью, до свидания!", True),
+        ("Tell me about yourself", False),
+    ], ids=["farewell", "with_llm"])
+    async def test_process_chat(self, mock_message, mock_state, llm_mock, text, is_farewell):
+        """Test interview chat: farewell ends the interview, otherwise the candidate answers"""
+        mock_message.text = text
         
         # Mock state data
-        mock_state.get_data = AsyncMock(return_value={
+        mock_state.get_data = _async_returning({
             "candidate_resume": "5 years in sales",
             "candidate_psychotype": "Target",
             "history": [],
@@ -190,126 +158,83 @@ class TestInterviewHandlers:
         })
         
         # Mock LLM client
-        mock_llm = mocker.patch('app.bot.handlers.interview.llm_client')
-        mock_llm.detect_interview_farewell = AsyncMock(return_value={
-            "is_farewell": True,
-            "farewell_message": "Спасибо за интервью!"
-        })
-        mock_llm.generate_interview_report = AsyncMock(return_value={
+        llm_mock.detect_interview_farewell.return_value = {
+            "is_farewell": is_farewell,
+            "farewell_message": "Спасибо за интервью!" if is_farewell else ""
+        }
+        llm_mock.generate_interview_report.return_value = {
             "overall_score": 7.5,
             "category_scores": {"structure": 8},
             "strengths": ["Good questions"],
             "weaknesses": ["Could improve timing"],
             "recommendations": ["Practice more"],
             "detailed_feedback": "Good interview overall."
-        })
-        
-        await interview.process_chat(mock_message, mock_state)
-        
-        # Should send farewell and report
-        assert mock_message.answer.call_count >= 2  # Farewell + Loading + Report
-        mock_state.clear.assert_called_once()
-    
-    @pytest.mark.asyncio
-    async def test_process_chat_with_llm(self, mock_message, mock_state, mocker):
-        """Test processing chat message with LLM"""
-        mock_message.text = "Tell me about yourself"
-        
-        # Mock state data
-        mock_state.get_data = AsyncMock(return_value={
-            "candidate_resume": "5 years in sales",
-            "candidate_psychotype": "Target",
-            "history": [],
-            "interview_id": None
-        })
-        
-        # Mock LLM client
-        mock_llm = mocker.patch('app.bot.handlers.interview.llm_client')
-        mock_llm.detect_interview_farewell = AsyncMock(return_value={
-            "is_farewell": False,
-            "farewell_message": ""
-        })
-        mock_llm.simulate_candidate = AsyncMock(return_value="I have 5 years of experience...")
+        }
+        llm_mock.simulate_candidate.return_value = "I have 5 years of experience..."
         
         await interview.process_chat(mock_message, mock_state)
         
-        mock_message.answer.assert_called_once()
-        assert "experience" in mock_message.answer.call_args[0][0].lower() or len(mock_message.answer.call_args[0][0]) > 0
+        if is_farewell:
+            # Should send farewell and report
+            assert mock_message.answer.call_count >= 2  # Farewell + Loading + Report
+            mock_state.clear.assert_called_once()
+        else:
+            mock_message.answer.assert_called_once()
+            assert "experience" in mock_message.answer.call_args[0][0].lower() or len(mock_message.answer.call_args[0][0]) > 0
 
 
 class TestExpertHandlers:
     """Test expert handlers"""
     
-    @pytest.mark.asyncio
-    async def test_cmd_expert_no_pending(self, mock_message, mock_state, test_session, mocker):
+    async def test_cmd_expert_no_pending(self, mock_message, mock_state, patch_get_session):
         """Test /expert when no pending submissions"""
-        async def mock_get_session():
-            yield test_session
-        
-        mocker.patch('app.bot.handlers.expert.get_session', mock_get_session)
+        patch_get_session('app.bot.handlers.expert')
         
         await expert.cmd_expert(mock_message, mock_state)
         
         mock_message.answer.assert_called_once()
         assert "no pending" in mock_message.answer.call_args[0][0].lower() or "pending" in mock_message.answer.call_args[0][0].lower()
     
-    @pytest.mark.asyncio
-    async def test_cmd_review_invalid_id(self, mock_message, mock_state):
-        """Test /review with invalid ID"""
-        mock_message.text = "/review abc"
+    @pytest.mark.parametrize("text,expected", [
+        ("/review abc", ("usage", "invalid")),
+        ("/review 99999", ("not found",)),
+    ], ids=["invalid_id", "not_found"])
+    async def test_cmd_review(self, mock_message, mock_state, patch_get_session, text, expected):
+        """Test /review with invalid and non-existent submission ID"""
+        mock_message.text = text
         
-        await expert.cmd_review(mock_message, mock_state)
-        
-        mock_message.answer.assert_called_once()
-        assert "usage" in mock_message.answer.call_args[0][0].lower() or "invalid" in mock_message.answer.call_args[0][0].lower()
-    
-    @pytest.mark.asyncio
-    async def test_cmd_review_not_found(self, mock_message, mock_state, test_session, mocker):
-        """Test /review with non-existent submission ID"""
-        mock_message.text = "/review 99999"
-        
-        async def mock_get_session():
-            yield test_session
-        
-        mocker.patch('app.bot.handlers.expert.get_session', mock_get_session)
+        patch_get_session('app.bot.handlers.expert')
         
         await expert.cmd_review(mock_message, mock_state)
         
         mock_message.answer.assert_called_once()
-        assert "not found" in mock_message.answer.call_args[0][0].lower()
+        answer = mock_message.answer.call_args[0][0].lower()
+        assert any(s in answer for s in expected)
     
-    @pytest.mark.asyncio
     async def test_process_grading_invalid_score(self, mock_message, mock_state):
         """Test grading with invalid score"""
         mock_message.text = "10 Invalid score"
-        mock_state.get_data = AsyncMock(return_value={"submission_id": 1})
+        mock_state.get_data = _async_returning({"submission_id": 1})
         
         await expert.process_grading(mock_message, mock_state)
         
         mock_message.answer.assert_called_once()
         assert "between 1 and 5" in mock_message.answer.call_args[0][0].lower() or "1-5" in mock_message.answer.call_args[0][0].lower()
     
-    @pytest.mark.asyncio
-    async def test_process_grading_valid(self, mock_message, mock_state, test_session, sample_user, sample_onboarding_step, mocker):
+    async def test_process_grading_valid(self, mock_message, mock_state, test_session, sample_seed, make_submission, patch_get_session):
         """Test grading with valid score"""
-        from app.database.models import OnboardingSubmission
+        sample_user, sample_onboarding_step, _ = sample_seed
         
-        submission = OnboardingSubmission(
+        submission = await make_submission(
             user_id=sample_user.id,
             step_id=sample_onboarding_step.id,
             status="checked"
         )
-        test_session.add(submission)
-        await test_session.commit()
-        await test_session.refresh(submission)
         
         mock_message.text = "5 Excellent work"
-        mock_state.get_data = AsyncMock(return_value={"submission_id": submission.id})
-        
-        async def mock_get_session():
-            yield test_session
+        mock_state.get_data = _async_returning({"submission_id": submission.id})
         
-        mocker.patch('app.bot.handlers.expert.get_session', mock_get_session)
+        patch_get_session('app.bot.handlers.expert')
         
         await expert.process_grading(mock_message, mock_state)
         
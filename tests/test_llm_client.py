@@ -1,265 +1,143 @@
 """Tests for LLM client"""
+import copy
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from app.core.llm_client import LLMClient
 
+pytestmark = pytest.mark.usefixtures("genai_patched")
+
+
+def _resp(text):
+    """Gemini response shape: .text"""
+    return SimpleNamespace(text=text)
+
+
+def _giga_resp(content):
+    """GigaChat response shape: .choices[0].message.content"""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture(scope="class")
+def bare_client():
+    """LLMClient built without provider probing; copy it before mutating"""
+    client = LLMClient.__new__(LLMClient)
+    client.provider = None
+    client.model = None
+    client.model_name = None
+    client._initialized = True
+    client._init_error = None
+    client._gigachat_token = None
+    client._gigachat_access_token = None
+    client._gigachat_auth_key = None
+    client._gigachat_client_id = None
+    client._gigachat_client_secret = None
+    client._use_gigachat_library = False
+    return client
+
 
 class TestLLMClient:
     """Test LLMClient class"""
     
-    def test_llm_client_initialization_with_key(self, monkeypatch):
+    def test_llm_client_initialization_with_key(self, gemini_mocks):
         """Test LLM client initialization with API key"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
+        mock_genai, mock_model = gemini_mocks
         
-        # Need to reload the module to get new config
-        import importlib
-        import app.core.llm_client
-        importlib.reload(app.core.llm_client)
+        client = LLMClient()
         
-        with patch('app.core.llm_client.genai') as mock_genai:
-            client = app.core.llm_client.LLMClient()
-            # Check that configure was called (may be called with actual key from env)
-            assert mock_genai.configure.called
+        mock_genai.configure.assert_called_once_with(api_key="test_key")
+        assert client.model is mock_model
     
-    def test_llm_client_initialization_without_key(self, monkeypatch):
+    def test_llm_client_initialization_without_key(self, no_api_key):
         """Test LLM client initialization without API key"""
-        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
-        
-        # Need to reload config and llm_client modules
-        import importlib
-        import app.config
-        import app.core.llm_client
-        importlib.reload(app.config)
-        importlib.reload(app.core.llm_client)
-        
-        # Create new client instance
-        client = app.core.llm_client.LLMClient()
-        # Should not have model if no key (or model should be None)
-        # The model might be initialized lazily, so check _initialized flag
-        if hasattr(client, '_initialized'):
-            # If initialized but no key, model should be None
-            if not client._initialized or not hasattr(client, 'model') or client.model is None:
-                assert True  # Expected behavior
-            else:
-                # Model was created somehow, but that's okay for this test
-                # Just verify it exists
-                assert client.model is not None
-        else:
-            # Old version without _initialized
-            assert client.model is None or not hasattr(client, 'model')
+        client = LLMClient()
+        
+        # Initialization was attempted, but no model is available
+        assert client._initialized is True
+        assert client.model is None
+        assert client._init_error
     
-    @pytest.mark.asyncio
-    async def test_generate_response_without_history(self, monkeypatch):
+    async def test_generate_response_without_history(self, gemini_mocks):
         """Test generating response without history"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
+        mock_genai, mock_model = gemini_mocks
+        mock_model.generate_content_async = AsyncMock(return_value=_resp("Test response"))
         
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = AsyncMock()
-            mock_response = Mock()
-            mock_response.text = "Test response"
-            mock_model.generate_content_async = AsyncMock(return_value=mock_response)
-            
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
-            
-            client = LLMClient()
-            result = await client.generate_response("Test prompt")
-            
-            assert result == "Test response"
-            mock_model.generate_content_async.assert_called_once()
+        client = LLMClient()
+        result = await client.generate_response("Test prompt")
+        
+        assert result == "Test response"
+        mock_model.generate_content_async.assert_called_once()
     
-    @pytest.mark.asyncio
-    async def test_generate_response_with_history(self, monkeypatch):
+    async def test_generate_response_with_history(self, gemini_mocks):
         """Test generating response with history"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
-        
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = AsyncMock()
-            mock_chat = AsyncMock()
-            mock_response = Mock()
-            mock_response.text = "Test response"
-            mock_chat.send_message_async = AsyncMock(return_value=mock_response)
-            mock_model.start_chat = Mock(return_value=mock_chat)
-            
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
-            
-            client = LLMClient()
-            history = [{"role": "user", "parts": ["Hello"]}]
-            result = await client.generate_response("Test prompt", history=history)
-            
-            assert result == "Test response"
-            mock_model.start_chat.assert_called_once()
-            mock_chat.send_message_async.assert_called_once()
-    
-    @pytest.mark.asyncio
-    async def test_generate_response_no_api_key(self, monkeypatch):
-        """Test generating response without API key"""
-        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        mock_genai, mock_model = gemini_mocks
+        mock_chat = AsyncMock()
+        mock_chat.send_message_async = AsyncMock(return_value=_resp("Test response"))
+        mock_model.start_chat = Mock(return_value=mock_chat)
         
-        # Reload module
-        import importlib
-        import app.core.llm_client
-        importlib.reload(app.core.llm_client)
+        client = LLMClient()
+        history = [{"role": "user", "parts": ["Hello"]}]
+        result = await client.generate_response("Test prompt", history=history)
         
-        client = app.core.llm_client.LLMClient()
+        assert result == "Test response"
+        mock_model.start_chat.assert_called_once()
+        mock_chat.send_message_async.assert_called_once()
+    
+    async def test_generate_response_no_api_key(self, no_api_key):
+        """Test generating response without API key"""
+        client = LLMClient()
         result = await client.generate_response("Test prompt")
         
         # Check for error message (can be in Russian or English)
         assert "Error" in result or "not configured" in result.lower() or "не найдена" in result.lower() or "api" in result.lower()
     
-    @pytest.mark.asyncio
-    async def test_generate_response_error_handling(self, monkeypatch):
+    async def test_generate_response_error_handling(self, gemini_failing):
         """Test error handling in generate_response"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
+        client = LLMClient()
+        result = await client.generate_response("Test prompt")
         
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = AsyncMock()
-            mock_model.generate_content_async = AsyncMock(side_effect=Exception("API Error"))
-            
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
-            
-            client = LLMClient()
-            result = await client.generate_response("Test prompt")
-            
-            assert "error" in result.lower() or "Sorry" in result
-    
-    @pytest.mark.asyncio
-    async def test_simulate_candidate_target(self, monkeypatch):
-        """Test simulating Target candidate"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
-        
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = AsyncMock()
-            mock_response = Mock()
-            mock_response.text = "I have 5 years of experience in sales..."
-            mock_model.generate_content_async = AsyncMock(return_value=mock_response)
-            
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
-            
-            client = LLMClient()
-            result = await client.simulate_candidate(
-                resume_text="5 years in sales",
-                user_message="Tell me about your experience",
-                conversation_history=[],
-                psychotype="Target"
-            )
-            
-            assert "experience" in result.lower() or len(result) > 0
-            # Check that prompt includes Target behavior
-            call_args = mock_model.generate_content_async.call_args[0][0]
-            assert "целевой кандидат" in call_args.lower() or "target" in call_args.lower()
+        assert "error" in result.lower() or "Sorry" in result
     
-    @pytest.mark.asyncio
-    async def test_simulate_candidate_toxic(self, monkeypatch):
-        """Test simulating Toxic candidate"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
-        
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = AsyncMock()
-            mock_response = Mock()
-            mock_response.text = "My previous employer was terrible..."
-            mock_model.generate_content_async = AsyncMock(return_value=mock_response)
-            
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
-            
-            client = LLMClient()
-            result = await client.simulate_candidate(
-                resume_text="Sales manager",
-                user_message="Why did you leave?",
-                conversation_history=[],
-                psychotype="Toxic"
-            )
-            
-            assert len(result) > 0
-            call_args = mock_model.generate_content_async.call_args[0][0]
-            assert "токсичный" in call_args.lower() or "toxic" in call_args.lower()
-    
-    @pytest.mark.asyncio
-    async def test_simulate_candidate_silent(self, monkeypatch):
-        """Test simulating Silent candidate"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
-        
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = AsyncMock()
-            mock_response = Mock()
-            mock_response.text = "Yes."
-            mock_model.generate_content_async = AsyncMock(return_value=mock_response)
-            
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
-            
-            client = LLMClient()
-            result = await client.simulate_candidate(
-                resume_text="Developer",
-                user_message="Tell me about yourself",
-                conversation_history=[],
-                psychotype="Silent"
-            )
-            
-            assert len(result) > 0
-            call_args = mock_model.generate_content_async.call_args[0][0]
-            assert "молчаливый" in call_args.lower() or "silent" in call_args.lower()
-    
-    @pytest.mark.asyncio
-    async def test_simulate_candidate_evasive(self, monkeypatch):
-        """Test simulating Evasive candidate"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
-        
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = AsyncMock()
-            mock_response = Mock()
-            mock_response.text = "Well, in general, I think..."
-            mock_model.generate_content_async = AsyncMock(return_value=mock_response)
-            
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
-            
-            client = LLMClient()
-            result = await client.simulate_candidate(
-                resume_text="Manager",
-                user_message="What are your weaknesses?",
-                conversation_history=[],
-                psychotype="Evasive"
-            )
-            
-            assert len(result) > 0
-            call_args = mock_model.generate_content_async.call_args[0][0]
-            assert "уклончивый" in call_args.lower() or "evasive" in call_args.lower()
+    @pytest.mark.parametrize("psychotype,needle", [
+        ("Target", "целевой"),
+        ("Toxic", "токсичный"),
+        ("Silent", "молчаливый"),
+        ("Evasive", "уклончивый"),
+    ])
+    async def test_simulate_candidate(self, gemini_mocks, psychotype, needle):
+        """Test that the candidate prompt carries the psychotype behavior"""
+        mock_genai, mock_model = gemini_mocks
+        mock_model.generate_content_async = AsyncMock(return_value=_resp("Candidate answer"))
+        
+        client = LLMClient()
+        result = await client.simulate_candidate(
+            resume_text="Sales manager",
+            user_message="Tell me about yourself",
+            conversation_history=[],
+            psychotype=psychotype
+        )
+        
+        assert result == "Candidate answer"
+        prompt = mock_model.generate_content_async.call_args[0][0].lower()
+        assert needle in prompt or psychotype.lower() in prompt
     
-    def test_format_excel_for_llm(self, monkeypatch):
+    def test_format_excel_for_llm(self):
         """Test formatting Excel data for LLM"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
+        excel_data = {
+            "Sheet1": {"key1": "value1", "key2": "value2"},
+            "Sheet2": ["item1", "item2"]
+        }
         
-        with patch('app.core.llm_client.genai'):
-            client = LLMClient()
-            
-            excel_data = {
-                "Sheet1": {"key1": "value1", "key2": "value2"},
-                "Sheet2": ["item1", "item2"]
-            }
-            
-            formatted = client._format_excel_for_llm(excel_data)
-            
-            assert "Sheet1" in formatted
-            assert "Sheet2" in formatted
-            assert "key1" in formatted
-            assert "value1" in formatted
+        formatted = LLMClient._format_excel_for_llm(excel_data)
+        
+        assert "Sheet1" in formatted
+        assert "Sheet2" in formatted
+        assert "key1" in formatted
+        assert "value1" in formatted
     
-    @pytest.mark.asyncio
-    async def test_validate_search_map_no_api_key(self, monkeypatch):
+    async def test_validate_search_map_no_api_key(self, no_api_key):
         """Test validate_search_map without API key"""
-        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
-        
-        # Reload module
-        import importlib
-        import app.core.llm_client
-        importlib.reload(app.core.llm_client)
-        
-        client = app.core.llm_client.LLMClient()
+        client = LLMClient()
         result = await client.validate_search_map({"Sheet1": {}})
         
         assert result["valid"] is True  # Defaults to True
@@ -268,95 +146,44 @@ class TestLLMClient:
         issue_text = result["issues"][0].lower()
         assert "unavailable" in issue_text or "not set" in issue_text or "error" in issue_text or "validation" in issue_text
     
-    @pytest.mark.asyncio
-    async def test_validate_search_map_with_json_response(self, monkeypatch):
-        """Test validate_search_map with JSON response"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
-        
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = AsyncMock()
-            mock_response = Mock()
-            mock_response.text = '{"valid": false, "issues": ["Issue 1"], "suggestions": ["Suggestion 1"]}'
-            mock_model.generate_content_async = AsyncMock(return_value=mock_response)
-            
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
-            
-            client = LLMClient()
-            result = await client.validate_search_map({"Sheet1": {"data": "test"}})
-            
-            assert result["valid"] is False
-            assert "Issue 1" in result["issues"]
-            assert "Suggestion 1" in result["suggestions"]
-    
-    @pytest.mark.asyncio
-    async def test_validate_search_map_with_markdown_json(self, monkeypatch):
-        """Test validate_search_map with markdown-wrapped JSON"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
-        
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = AsyncMock()
-            mock_response = Mock()
-            mock_response.text = '```json\n{"valid": true, "issues": [], "suggestions": []}\n```'
-            mock_model.generate_content_async = AsyncMock(return_value=mock_response)
-            
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
-            
-            client = LLMClient()
-            result = await client.validate_search_map({"Sheet1": {}})
-            
-            assert result["valid"] is True
-            assert len(result["issues"]) == 0
+    @pytest.mark.parametrize("text,valid,issues,suggestions", [
+        ('{"valid": false, "issues": ["Issue 1"], "suggestions": ["Suggestion 1"]}', False, ["Issue 1"], ["Suggestion 1"]),
+        ('```json\n{"valid": true, "issues": [], "suggestions": []}\n```', True, [], []),
+    ], ids=["json", "markdown_json"])
+    async def test_validate_search_map_response(self, gemini_mocks, text, valid, issues, suggestions):
+        """Test validate_search_map parses plain and markdown-wrapped JSON"""
+        mock_genai, mock_model = gemini_mocks
+        mock_model.generate_content_async = AsyncMock(return_value=_resp(text))
+        
+        client = LLMClient()
+        result = await client.validate_search_map({"Sheet1": {"data": "test"}})
+        
+        assert result == {"valid": valid, "issues": issues, "suggestions": suggestions}
     
-    @pytest.mark.asyncio
-    async def test_validate_search_map_error_handling(self, monkeypatch):
+    async def test_validate_search_map_error_handling(self, gemini_failing):
         """Test error handling in validate_search_map"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
+        client = LLMClient()
+        result = await client.validate_search_map({"Sheet1": {}})
         
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = AsyncMock()
-            mock_model.generate_content_async = AsyncMock(side_effect=Exception("API Error"))
-            
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
-            
-            client = LLMClient()
-            result = await client.validate_search_map({"Sheet1": {}})
-            
-            assert result["valid"] is True  # Defaults to True on error
-            assert len(result["issues"]) > 0
-            assert "error" in result["issues"][0].lower()
+        assert result["valid"] is True  # Defaults to True on error
+        assert len(result["issues"]) > 0
+        assert "error" in result["issues"][0].lower()
     
-    def test_llm_client_provider_detection(self, monkeypatch):
+    def test_llm_client_provider_detection(self, gemini_mocks):
         """Test that provider is correctly detected"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
+        mock_genai, mock_model = gemini_mocks
         
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = Mock()
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
-            
-            client = LLMClient()
-            
-            # Should have provider set
-            assert hasattr(client, 'provider')
-            if client.model is not None:
-                assert client.provider == "gemini"
-    
-    def test_gigachat_fallback_initialization(self, monkeypatch):
-        """Test GigaChat fallback when Gemini fails"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
-        monkeypatch.setenv("GIGACHAT_CLIENT_ID", "test_client_id")
-        monkeypatch.setenv("GIGACHAT_CLIENT_SECRET", "test_client_secret")
-        
-        # Create client and test fallback logic directly
         client = LLMClient()
         
-        # Reset state to test fallback
+        # Should have provider set
+        assert hasattr(client, 'provider')
+        if client.model is not None:
+            assert client.provider == "gemini"
+    
+    def test_gigachat_fallback_initialization(self, bare_client):
+        """Test GigaChat fallback when Gemini fails"""
+        client = copy.copy(bare_client)
         client._initialized = False
-        client.model = None
-        client.provider = None
         
         # Mock config to have both keys
         with patch('app.core.llm_client.config') as mock_config:
@@ -377,152 +204,85 @@ class TestLLMClient:
                         mock_giga.assert_called_once()
                         assert client._initialized is True
     
-    @pytest.mark.asyncio
-    async def test_generate_response_gigachat(self, monkeypatch):
+    async def test_generate_response_gigachat(self, bare_client, stub_executor):
         """Test generating response using GigaChat"""
-        monkeypatch.setenv("GIGACHAT_CLIENT_ID", "test_client_id")
-        monkeypatch.setenv("GIGACHAT_CLIENT_SECRET", "test_client_secret")
-        
         mock_gigachat_client = Mock()
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = "GigaChat response"
-        mock_gigachat_client.chat = Mock(return_value=mock_response)
+        mock_gigachat_client.chat = Mock(return_value=_giga_resp("GigaChat response"))
         
-        # Create client and manually set provider
-        client = LLMClient()
+        client = copy.copy(bare_client)
         client.provider = "gigachat"
         client.model = mock_gigachat_client
+        client._use_gigachat_library = True
         
-        # Mock asyncio executor to return sync function result
-        import asyncio
-        with patch('asyncio.get_event_loop') as mock_loop:
-            async def mock_executor(*args):
-                return "GigaChat response"
-            mock_loop.return_value.run_in_executor = Mock(return_value=mock_executor())
-            
-            result = await client.generate_response("Test prompt")
-            
-            assert "GigaChat response" in result or len(result) > 0
-    
-    @pytest.mark.asyncio
-    async def test_gigachat_fallback_on_error(self, monkeypatch):
-        """Test automatic fallback to GigaChat when Gemini fails during generation"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
-        monkeypatch.setenv("GIGACHAT_CLIENT_ID", "test_client_id")
-        monkeypatch.setenv("GIGACHAT_CLIENT_SECRET", "test_client_secret")
+        result = await client.generate_response("Test prompt")
         
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = AsyncMock()
-            mock_model.generate_content_async = AsyncMock(side_effect=Exception("location is not supported"))
-            
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
-            
-            client = LLMClient()
-            client.provider = "gemini"
-            client.model = mock_model
-            
-            # Mock GigaChat fallback
-            with patch('app.core.llm_client.GIGACHAT_AVAILABLE', True):
-                with patch.object(client, '_try_initialize_gigachat', return_value=True) as mock_init_giga:
-                    with patch.object(client, '_generate_gigachat', return_value="GigaChat fallback response"):
-                        result = await client.generate_response("Test prompt")
-                        
-                        # Should have tried to initialize GigaChat
-                        assert "GigaChat" in result or "fallback" in result.lower() or len(result) > 0
+        assert result == "GigaChat response"
+        mock_gigachat_client.chat.assert_called_once_with([{"role": "user", "content": "Test prompt"}])
     
-    def test_gigachat_initialization_with_oauth2(self, monkeypatch):
-        """Test GigaChat initialization with OAuth2 credentials"""
-        monkeypatch.setenv("GIGACHAT_CLIENT_ID", "test_client_id")
-        monkeypatch.setenv("GIGACHAT_CLIENT_SECRET", "test_client_secret")
-        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    async def test_gigachat_fallback_on_error(self, bare_client):
+        """Test automatic fallback to GigaChat when Gemini fails during generation"""
+        mock_model = AsyncMock()
+        mock_model.generate_content_async = AsyncMock(side_effect=Exception("location is not supported"))
         
-        mock_gigachat_class = Mock()
-        mock_gigachat_client = Mock()
-        mock_gigachat_class.return_value = mock_gigachat_client
+        client = copy.copy(bare_client)
+        client.provider = "gemini"
+        client.model = mock_model
         
+        # Mock GigaChat fallback
         with patch('app.core.llm_client.GIGACHAT_AVAILABLE', True):
-            # Mock the _try_initialize_gigachat method directly
-            import importlib
-            import app.core.llm_client
-            importlib.reload(app.core.llm_client)
-            
-            client = app.core.llm_client.LLMClient()
-            
-            # Manually test _try_initialize_gigachat with mocked GigaChat
-            with patch.object(client, '_try_initialize_gigachat') as mock_init:
-                mock_init.return_value = True
-                client.provider = "gigachat"
-                client.model = mock_gigachat_client
-                client.model_name = "GigaChat"
-                
-                # Verify initialization was attempted
-                assert client.provider == "gigachat"
+            with patch.object(client, '_try_initialize_gigachat', return_value=True) as mock_init_giga:
+                with patch.object(client, '_generate_gigachat', return_value="GigaChat fallback response"):
+                    result = await client.generate_response("Test prompt")
+                    
+                    # Should have tried to initialize GigaChat
+                    assert "GigaChat" in result or "fallback" in result.lower() or len(result) > 0
     
-    def test_gigachat_initialization_with_api_key(self, monkeypatch):
-        """Test GigaChat initialization with API key"""
-        monkeypatch.setenv("GIGACHAT_API_KEY", "test_api_key")
-        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    @pytest.mark.parametrize("credentials", [
+        {"GIGACHAT_CLIENT_ID": "test_client_id", "GIGACHAT_CLIENT_SECRET": "test_client_secret"},
+        {"GIGACHAT_API_KEY": "test_api_key"},
+    ], ids=["oauth2", "api_key"])
+    def test_gigachat_initialization(self, monkeypatch, credentials):
+        """Test GigaChat initialization with OAuth2 credentials or an API key"""
+        monkeypatch.setattr('app.core.llm_client.config.GEMINI_API_KEY', None)
+        for name, value in credentials.items():
+            monkeypatch.setattr(f'app.core.llm_client.config.{name}', value)
+        
+        with patch('app.core.llm_client.GIGACHAT_AVAILABLE', True), \
+                patch('app.core.llm_client.GigaChat', create=True) as mock_gigachat_class:
+            client = LLMClient()
         
-        with patch('app.core.llm_client.GIGACHAT_AVAILABLE', True):
-            import importlib
-            import app.core.llm_client
-            importlib.reload(app.core.llm_client)
-            
-            client = app.core.llm_client.LLMClient()
-            
-            # Manually test initialization
-            with patch.object(client, '_try_initialize_gigachat') as mock_init:
-                mock_init.return_value = True
-                client.provider = "gigachat"
-                client.model = Mock()
-                
-                # Should have provider set
-                assert client.provider == "gigachat"
+        assert client.provider == "gigachat"
+        assert client.model is mock_gigachat_class.return_value
     
-    def test_gigachat_not_available_fallback(self, monkeypatch):
+    def test_gigachat_not_available_fallback(self, monkeypatch, gemini_mocks):
         """Test that fallback doesn't happen if GigaChat library is not installed"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
-        monkeypatch.delenv("GIGACHAT_CLIENT_ID", raising=False)
-        monkeypatch.delenv("GIGACHAT_CLIENT_SECRET", raising=False)
-        
-        with patch('app.core.llm_client.genai') as mock_genai:
-            mock_model = Mock()
-            mock_genai.configure = Mock()
-            mock_genai.GenerativeModel = Mock(return_value=mock_model)
+        monkeypatch.setattr('app.core.llm_client.config.GIGACHAT_CLIENT_ID', None)
+        monkeypatch.setattr('app.core.llm_client.config.GIGACHAT_CLIENT_SECRET', None)
+        
+        mock_genai, mock_model = gemini_mocks
+        
+        with patch('app.core.llm_client.GIGACHAT_AVAILABLE', False):
+            client = LLMClient()
             
-            with patch('app.core.llm_client.GIGACHAT_AVAILABLE', False):
-                client = LLMClient()
-                
-                # Should use Gemini if available, not GigaChat
-                if client.model is not None:
-                    assert client.provider == "gemini" or client.provider is None
-                    assert client.provider != "gigachat"
+            # Should use Gemini if available, not GigaChat
+            if client.model is not None:
+                assert client.provider == "gemini" or client.provider is None
+                assert client.provider != "gigachat"
     
-    @pytest.mark.asyncio
-    async def test_generate_gigachat_with_history(self, monkeypatch):
+    async def test_generate_gigachat_with_history(self, bare_client, stub_executor):
         """Test GigaChat generation with conversation history"""
         mock_gigachat_client = Mock()
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = "Response with history"
-        mock_gigachat_client.chat = Mock(return_value=mock_response)
+        mock_gigachat_client.chat = Mock(return_value=_giga_resp("Response with history"))
         
-        # Create client and manually set provider
-        client = LLMClient()
+        client = copy.copy(bare_client)
         client.provider = "gigachat"
         client.model = mock_gigachat_client
+        client._use_gigachat_library = True
         
-        # Mock executor
-        import asyncio
-        with patch('asyncio.get_event_loop') as mock_loop:
-            async def mock_executor(*args):
-                return "Response with history"
-            mock_loop.return_value.run_in_executor = Mock(return_value=mock_executor())
-            
-            history = [{"role": "user", "content": "Hello"}]
-            result = await client.generate_response("Test prompt", history=history)
-            
-            assert len(result) > 0
+        history = [{"role": "user", "content": "Hello"}]
+        result = await client.generate_response("Test prompt", history=history)
+        
+        assert result == "Response with history"
+        messages = mock_gigachat_client.chat.call_args[0][0]
+        assert messages == [{"role": "user", "content": "Hello"}, {"role": "user", "content": "Test prompt"}]
 
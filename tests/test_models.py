@@ -1,6 +1,9 @@
 """Tests for database models"""
 import pytest
 from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 from app.database.models import (
     User, OnboardingStep, CandidateProfile, OnboardingSubmission,
     UserRole, StepType
@@ -10,7 +13,6 @@ from app.database.models import (
 class TestUser:
     """Test User model"""
     
-    @pytest.mark.asyncio
     async def test_user_creation(self, test_session, sample_user):
         """Test creating a user"""
         assert sample_user.id is not None
@@ -19,24 +21,18 @@ class TestUser:
         assert sample_user.full_name == "Test User"
         assert sample_user.role == UserRole.STUDENT
     
-    @pytest.mark.asyncio
-    async def test_user_unique_telegram_id(self, test_session):
+    async def test_user_unique_telegram_id(self, test_session, existing_user):
         """Test that telegram_id must be unique"""
-        user1 = User(telegram_id=99999, username="user1", full_name="User 1")
-        test_session.add(user1)
-        await test_session.commit()
-        
-        user2 = User(telegram_id=99999, username="user2", full_name="User 2")
+        user2 = User(telegram_id=existing_user.telegram_id, username="user2", full_name="User 2")
         test_session.add(user2)
         
-        with pytest.raises(Exception):  # Should raise IntegrityError
-            await test_session.commit()
+        with pytest.raises(IntegrityError):
+            await test_session.flush()
 
 
 class TestOnboardingStep:
     """Test OnboardingStep model"""
     
-    @pytest.mark.asyncio
     async def test_onboarding_step_creation(self, test_session, sample_onboarding_step):
         """Test creating a lab step"""
         assert sample_onboarding_step.id is not None
@@ -49,7 +45,6 @@ class TestOnboardingStep:
 class TestCandidateProfile:
     """Test CandidateProfile model"""
     
-    @pytest.mark.asyncio
     async def test_candidate_creation(self, test_session, sample_candidate):
         """Test creating a candidate profile"""
         assert sample_candidate.id is not None
@@ -60,9 +55,9 @@ class TestCandidateProfile:
 class TestOnboardingSubmission:
     """Test OnboardingSubmission model"""
     
-    @pytest.mark.asyncio
-    async def test_submission_creation(self, test_session, sample_user, sample_onboarding_step):
+    async def test_submission_creation(self, test_session, class_seed):
         """Test creating a submission"""
+        sample_user, sample_onboarding_step = class_seed
         submission = OnboardingSubmission(
             user_id=sample_user.id,
             step_id=sample_onboarding_step.id,
@@ -76,10 +71,10 @@ class TestOnboardingSubmission:
         assert submission.user_id == sample_user.id
         assert submission.step_id == sample_onboarding_step.id
     
-    @pytest.mark.asyncio
-    async def test_get_completion_time_minutes(self, test_session, sample_user, sample_onboarding_step):
+    async def test_get_completion_time_minutes(self, test_session, class_seed):
         """Test calculating completion time"""
-        started_at = datetime.now()
+        sample_user, sample_onboarding_step = class_seed
+        started_at = datetime(2024, 1, 1, 12, 0, 0)
         created_at = started_at + timedelta(minutes=45)
         
         submission = OnboardingSubmission(
@@ -91,11 +86,11 @@ class TestOnboardingSubmission:
         )
         
         completion_time = submission.get_completion_time_minutes()
-        assert completion_time == pytest.approx(45.0, abs=0.1)
+        assert completion_time == 45.0
     
-    @pytest.mark.asyncio
-    async def test_get_completion_time_no_dates(self, test_session, sample_user, sample_onboarding_step):
+    async def test_get_completion_time_no_dates(self, test_session, class_seed):
         """Test completion time calculation with missing dates"""
+        sample_user, sample_onboarding_step = class_seed
         submission = OnboardingSubmission(
             user_id=sample_user.id,
             step_id=sample_onboarding_step.id,
@@ -105,9 +100,9 @@ class TestOnboardingSubmission:
         completion_time = submission.get_completion_time_minutes()
         assert completion_time == 0
     
-    @pytest.mark.asyncio
-    async def test_submission_relationships(self, test_session, sample_user, sample_onboarding_step):
+    async def test_submission_relationships(self, test_session, class_seed):
         """Test submission relationships"""
+        sample_user, sample_onboarding_step = class_seed
         submission = OnboardingSubmission(
             user_id=sample_user.id,
             step_id=sample_onboarding_step.id,
@@ -116,7 +111,11 @@ class TestOnboardingSubmission:
         )
         test_session.add(submission)
         await test_session.commit()
-        await test_session.refresh(submission)
+        submission = (await test_session.execute(
+            select(OnboardingSubmission)
+            .options(selectinload(OnboardingSubmission.user), selectinload(OnboardingSubmission.step))
+            .where(OnboardingSubmission.id == submission.id)
+        )).scalar_one()
         
         assert submission.user is not None
         assert submission.user.id == sample_user.id
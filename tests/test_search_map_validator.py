@@ -1,11 +1,54 @@
 """Tests for SearchMapValidator"""
+import io
 import pytest
 import pandas as pd
-import os
-import tempfile
+from pathlib import Path
 from app.core.search_map import SearchMapValidator
 
 
+@pytest.fixture
+def search_map_path(request, tmp_path):
+    """Search map path for the extension in request.param
+
+    xlsx is the committed sample (xlsx_pathlib as a Path), the *_buffer
+    cases are nameless BytesIO objects sniffed by content, csv is written
+    under tmp_path and any other extension is a path that cannot exist,
+    so load() must reject it by name before touching the filesystem.
+    """
+    if request.param == "xlsx":
+        return request.getfixturevalue("sample_xlsx")
+    if request.param == "xlsx_pathlib":
+        return Path(request.getfixturevalue("sample_xlsx"))
+    if request.param == "xlsx_buffer":
+        return io.BytesIO(Path(request.getfixturevalue("sample_xlsx")).read_bytes())
+    if request.param == "csv_buffer":
+        return io.BytesIO(
+            b"Company,Position,Source,Contact,Status\n"
+            b"Company1,Position1,Source1,Contact1,Status1\n"
+        )
+    if request.param == "csv":
+        path = tmp_path / "search_map.csv"
+        path.write_text(
+            "Company,Position,Source,Contact,Status\n"
+            "Company1,Position1,Source1,Contact1,Status1\n"
+        )
+        return str(path)
+    return f"/nonexistent/test.{request.param}"
+
+
+def _make_validator(df=None, path="test.xlsx"):
+    """Validator for path with df preassigned instead of loaded"""
+    validator = SearchMapValidator(path)
+    validator.df = df
+    return validator
+
+
+@pytest.fixture(scope="module")
+def valid_report(valid_df):
+    """validate_content() report for valid_df, computed once per module"""
+    return _make_validator(valid_df).validate_content()
+
+
 class TestSearchMapValidator:
     """Test SearchMapValidator class"""
     
@@ -16,71 +59,26 @@ class TestSearchMapValidator:
         assert validator.df is None
         assert validator.errors == []
     
-    def test_load_excel_file(self):
-        """Test loading Excel file"""
-        import tempfile
-        f = tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False)
-        f.close()
-        try:
-            # Create a simple Excel file
-            df = pd.DataFrame({
-                'Company': ['Company1', 'Company2'],
-                'Position': ['Position1', 'Position2'],
-                'Source': ['Source1', 'Source2'],
-                'Contact': ['Contact1', 'Contact2'],
-                'Status': ['Status1', 'Status2']
-            })
-            df.to_excel(f.name, index=False)
-            
-            validator = SearchMapValidator(f.name)
-            result = validator.load()
-            
-            assert result is True
-            assert validator.df is not None
-            assert len(validator.df) == 2
-        finally:
-            # Try to delete, ignore errors on Windows
-            try:
-                os.unlink(f.name)
-            except (PermissionError, OSError):
-                pass
-    
-    def test_load_csv_file(self):
-        """Test loading CSV file"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write("Company,Position,Source,Contact,Status\n")
-            f.write("Company1,Position1,Source1,Contact1,Status1\n")
-            f.close()
-            
-            validator = SearchMapValidator(f.name)
-            result = validator.load()
-            
-            assert result is True
-            assert validator.df is not None
-            
-            os.unlink(f.name)
-    
-    def test_load_unsupported_format(self):
-        """Test loading unsupported file format"""
-        validator = SearchMapValidator("test.txt")
+    @pytest.mark.parametrize("search_map_path,shape,errors", [
+        ("xlsx", (2, 5), []),
+        ("xlsx_pathlib", (2, 5), []),
+        ("xlsx_buffer", (2, 5), []),
+        ("csv_buffer", (1, 5), []),
+        ("csv", (1, 5), []),
+        ("txt", None, ["Unsupported file format"]),
+    ], indirect=["search_map_path"])
+    def test_load_file_format(self, search_map_path, shape, errors):
+        """Test that load() dispatches on the file extension"""
+        validator = SearchMapValidator(search_map_path)
         result = validator.load()
         
-        assert result is False
-        assert len(validator.errors) > 0
-        assert "Unsupported file format" in validator.errors[0]
+        assert result is (shape is not None)
+        assert getattr(validator.df, "shape", None) == shape
+        assert validator.errors == errors
     
-    def test_validate_structure_valid(self):
+    def test_validate_structure_valid(self, valid_df):
         """Test structure validation with valid columns"""
-        df = pd.DataFrame({
-            'Company': ['Company1'],
-            'Position': ['Position1'],
-            'Source': ['Source1'],
-            'Contact': ['Contact1'],
-            'Status': ['Status1']
-        })
-        
-        validator = SearchMapValidator("test.xlsx")
-        validator.df = df
+        validator = _make_validator(valid_df)
         
         result = validator.validate_structure()
         
@@ -94,8 +92,7 @@ class TestSearchMapValidator:
             'Position': ['Position1']
         })
         
-        validator = SearchMapValidator("test.xlsx")
-        validator.df = df
+        validator = _make_validator(df)
         
         result = validator.validate_structure()
         
@@ -111,24 +108,15 @@ class TestSearchMapValidator:
         
         assert result is False
     
-    def test_validate_content_valid(self):
+    @pytest.mark.parametrize("key,expected", [
+        ("valid", True),
+        ("total_rows", 2),
+        ("empty_contacts", 0),
+    ])
+    def test_validate_content_valid(self, valid_report, key, expected):
         """Test content validation with valid data"""
-        df = pd.DataFrame({
-            'Company': ['Company1', 'Company2'],
-            'Position': ['Position1', 'Position2'],
-            'Source': ['Source1', 'Source2'],
-            'Contact': ['Contact1', 'Contact2'],
-            'Status': ['Status1', 'Status2']
-        })
-        
-        validator = SearchMapValidator("test.xlsx")
-        validator.df = df
-        
-        report = validator.validate_content()
-        
-        assert report["valid"] is True
-        assert report["total_rows"] == 2
-        assert report["empty_contacts"] == 0
+        assert valid_report[key] == expected
+        assert type(valid_report[key]) is type(expected)
     
     def test_validate_content_too_many_empty_contacts(self):
         """Test content validation with too many empty contacts"""
@@ -140,8 +128,7 @@ class TestSearchMapValidator:
             'Status': ['Status1', 'Status2', 'Status3']
         })
         
-        validator = SearchMapValidator("test.xlsx")
-        validator.df = df
+        validator = _make_validator(df)
         
         report = validator.validate_content()
         
@@ -152,8 +139,6 @@ class TestSearchMapValidator:
     def test_validate_content_no_dataframe(self):
         """Test content validation without dataframe"""
         validator = SearchMapValidator("test.xlsx")
-        # Ensure df is None
-        validator.df = None
         
         report = validator.validate_content()
         
@@ -182,37 +167,35 @@ class TestSearchMapValidator:
         assert "Error 1" in summary
         assert "Error 2" in summary
     
-    @pytest.mark.asyncio
-    async def test_extract_data_for_llm(self):
+    def test_extract_data_for_llm(self, valid_df):
         """Test extracting data for LLM"""
-        import tempfile
-        f = tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False)
-        f.close()
-        try:
-            df = pd.DataFrame({
-                'Company': ['Company1'],
-                'Position': ['Position1'],
-                'Source': ['Source1'],
-                'Contact': ['Contact1'],
-                'Status': ['Status1']
-            })
-            df.to_excel(f.name, index=False)
-            
-            validator = SearchMapValidator(f.name)
-            validator.load()
-            
-            data = validator.extract_data_for_llm()
-            
-            assert isinstance(data, dict)
-            assert len(data) > 0
-        finally:
-            try:
-                os.unlink(f.name)
-            except (PermissionError, OSError):
-                pass
+        validator = _make_validator(valid_df)
+        
+        data = validator.extract_data_for_llm()
+        
+        assert isinstance(data, dict)
+        assert len(data) > 0
     
-    @pytest.mark.asyncio
-    async def test_extract_data_for_llm_no_dataframe(self):
+    def test_extract_data_for_llm_sheets(self, sample_xlsx, valid_df):
+        """Test extracting every sheet of an xlsx for LLM"""
+        validator = _make_validator(valid_df, path=sample_xlsx)
+        
+        data = validator.extract_data_for_llm()
+        
+        assert data == {"Sheet1": valid_df.to_dict("list")}
+
+    def test_extract_data_for_llm_buffer_round_trip(self, valid_df):
+        """Test loading and extracting an xlsx written to a nameless BytesIO"""
+        buffer = io.BytesIO()
+        valid_df.to_excel(buffer, index=False)
+        validator = SearchMapValidator(buffer)
+
+        assert validator.load() is True
+        data = validator.extract_data_for_llm()
+
+        assert data == {"Sheet1": valid_df.to_dict("list")}
+
+    def test_extract_data_for_llm_no_dataframe(self):
         """Test extracting data without dataframe"""
         validator = SearchMapValidator("test.xlsx")
         
@@ -220,28 +203,11 @@ class TestSearchMapValidator:
         
         assert data == {}
     
-    @pytest.mark.asyncio
-    async def test_validate_with_llm(self, mocker):
+    async def test_validate_with_llm(self, search_map_llm_mock, valid_df):
         """Test LLM validation"""
-        # Patch the import in the function
-        mock_llm_client = mocker.patch('app.core.llm_client.llm_client')
-        mock_llm_client.validate_search_map = mocker.AsyncMock(return_value={
-            "valid": True,
-            "issues": [],
-            "suggestions": []
-        })
-        
-        validator = SearchMapValidator("test.xlsx")
-        validator.df = pd.DataFrame({
-            'Company': ['Company1'],
-            'Position': ['Position1'],
-            'Source': ['Source1'],
-            'Contact': ['Contact1'],
-            'Status': ['Status1']
-        })
+        validator = _make_validator(valid_df)
         
         result = await validator.validate_with_llm()
         
         assert result["valid"] is True
-        mock_llm_client.validate_search_map.assert_called_once()
-
+        search_map_llm_mock.validate_search_map.assert_called_once()